@@ -3,12 +3,58 @@
 import asyncio
 from bleak import BleakScanner
 from blessed import Terminal
-import math
+import heapq
+import os
 import sys
+import re
 import select
+import signal
+import threading
 import time
-import csv
-from datetime import datetime, timezone
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+from operator import itemgetter
+
+# Common BLE appearance values
+APPEARANCES = {
+    0: 'Unknown',
+    64: 'Generic Phone',
+    128: 'Generic Computer',
+    192: 'Generic Watch',
+    193: 'Sports Watch',
+    256: 'Generic Tag',
+    832: 'Generic Heart Rate Sensor',
+    960: 'Generic Blood Pressure',
+}
+
+# Advertisement contents rarely change once a device has been seen, so the
+# formatted strings are cached on hashable keys derived from the metadata.
+@lru_cache(maxsize=256)
+def _services_summary(uuids):
+    return ', '.join(str(uuid)[:8] for uuid in uuids)[:40]
+
+@lru_cache(maxsize=256)
+def _manufacturer_summary(mfg_id, data_prefix):
+    return f'ID: {mfg_id:04x}, Data: {data_prefix.hex()[:20]}'
+
+def _csv_field(value):
+    """Quote a value for a CSV row the way csv.writer does (QUOTE_MINIMAL)"""
+    if any(c in value for c in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+# Begin/End Synchronized Update: terminals that support mode 2026 show the
+# frame written between these atomically; others ignore them
+BSU = '\x1b[?2026h'
+ESU = '\x1b[?2026l'
+
+# Turn terminal autowrap off/on (DECAWM)
+WRAP_OFF = '\x1b[?7l'
+WRAP_ON = '\x1b[?7h'
+
+# Splits raw terminal input into keys: CSI sequences (arrows, PgUp/PgDn) or single characters
+KEY_PATTERN = re.compile(rb'\x1b\[[0-9;]*[~A-Za-z]|.', re.DOTALL)
 
 class BLEScanner:
     def __init__(self):
@@ -17,6 +63,12 @@ class BLEScanner:
         self.max_name_length = 20
         self.max_addr_length = 17
         self.bar_length = 20
+        # Bars only depend on the 0-100 strength value, so build all 101 up front
+        self._bar_table = []
+        for strength in range(101):
+            filled_length = (strength * self.bar_length + 99) // 100  # Integer ceil
+            self._bar_table.append('█' * filled_length + '░' * (self.bar_length - filled_length))
+        self._inactive_bar = '.' * self.bar_length  # Placeholder bar for inactive devices
         self.display_mode = 'basic'  # 'basic' or 'detailed'
         self.running = True
         self.scanner = None
@@ -24,47 +76,103 @@ class BLEScanner:
         self.last_log_time = 0
         self.log_interval = 30  # Increased log interval to reduce I/O
         self.scan_count = 0
+        self._ts_int = None  # Whole second of the last formatted log timestamp
+        self._ts_str = ''  # ...and its formatted text
         self.selected_device_address = None  # Track device by address instead of index
         self.view_mode = 'list'  # 'list' or 'detail'
         self.last_screen_update = 0
         self.screen_update_interval = 0.2  # Screen refresh rate in seconds
+        self.max_screen_update_interval = 1.0  # Slowest refresh rate on a slow terminal
+        self._frame_interval = self.screen_update_interval  # Current, adaptive refresh interval
+        self._render_time_ema = 0.0  # Smoothed time taken to draw and flush a frame
+        self.idle_refresh_interval = 1.0  # Redraw at least this often so ages stay current
+        self._ui_dirty = True  # Set when something visible changed since the last redraw
+        self.min_tick = 0.05  # Shortest main loop period while advertisements keep arriving
+        self._wake_event = asyncio.Event()  # Ends an idle sleep early
+        self._key_fd = None  # stdin fd while it is watched for key presses
+        self._key_fd_blocking = True  # ...and its blocking mode before that
+        self._loop = None  # Event loop running scan_devices...
+        self._loop_thread = None  # ...and the thread it runs in
+        self._adv_queue = deque()  # (device, advertisement_data, time received) from Bleak
         self.device_timeout = 300  # Keep devices for 5 minutes instead of removing them
         self.inactive_threshold = 15  # Consider device inactive after 15 seconds
         self.discovery_times = {}  # Track when devices are first discovered
+        self._expiry_heap = []  # Min-heap of (last_seen, address) for timeout pruning
+        self.prune_interval = 5  # Seconds between timeout sweeps
+        self.last_prune_time = 0
+        self.rssi_window = 8  # Number of advertisements in the RSSI moving average
+        self._rssi_bufs = {}  # Recent raw RSSI readings and their sum per address
         self.sort_mode = 'discovery'  # 'discovery' or 'signal'
+        self._sorted_addrs = []  # Device addresses in current sort order
+        self._sort_dirty = True  # Set when the sort order may have changed
+        self._next_inactive_time = float('inf')  # When an active device next turns inactive
+        self._inactive_key = frozenset()  # Inactive addresses _inactive_order was sorted for
+        self._inactive_order = []  # Inactive addresses, most recently seen first
         self.status_width = 30  # Width for the status column
+        self._age_status = {}  # Age text -> padded "Last seen ... ago" status column
+        # Terminal size is cached (blessed queries it with an ioctl on every
+        # access) and refreshed on SIGWINCH
+        self._width = self.term.width
+        self._height = self.term.height
+        self._sep = "-" * self._width  # Horizontal separator line
+        # Like blessed's own sequences, only emitted when output is a terminal
+        self._bsu, self._esu = (BSU, ESU) if self.term.does_styling else ('', '')
+        self._last_lines = None  # Rows of the last frame written; None forces a full repaint
+        self._pending_output = b''  # Frame bytes the terminal hasn't accepted yet
+        self.write_timeout = 0.1  # Longest a frame write may wait on a slow terminal
+        # Escape sequences used for every frame, built once rather than through
+        # blessed's formatters per row (row prefixes are rebuilt on resize)
+        self._full_repaint = self.term.home + self.term.clear + WRAP_OFF
+        self._row_prefixes = []  # Per screen row: cursor move + clear to end of line
+        # Row template; the columns are stored already padded on each device
+        self._row_fmt = "{name_col} | {addr_col} | {bar} | {status}"
+        self._line_templates = []  # Per-line list view templates, see build_line_templates
+        # Raw highlight sequences, resolved once instead of through blessed per row
+        self._reverse_prefix = str(self.term.reverse)
+        self._dim_prefix = str(self.term.dim)
+        self._style_suffix = str(self.term.normal)
+        self._template_key = None  # Device order and selection the templates were built for
+        self._display_addrs = ()  # Addresses in the order last drawn (active, then inactive)
+        self._sorted_index = {}  # Address -> position in _display_addrs
+        self._device_rows = []  # List row of each device in _display_addrs
+        self._header_lines = None  # Cached list view header; None rebuilds it
         self.header_height = 5  # Height of the fixed header (title + info + column headers + separator)
+        # Raw key bytes -> handler, looked up once per key instead of an if/elif chain
+        self._key_handlers = {
+            b'\x1b[A': self._select_up,      # Up arrow
+            b'\x1b[B': self._select_down,    # Down arrow
+            b'\x1b[5~': self._page_up,       # Page Up
+            b'\x1b[6~': self._page_down,     # Page Down
+            b'\r': self._toggle_view,        # Enter
+            b'\n': self._toggle_view,
+            b's': self._toggle_sort,
+            b'q': self._back_to_list,
+            b'\x03': self._quit,             # Ctrl+C
+        }
         self.scroll_offset = 0  # Track scrolling position
         self.visible_lines = 0  # Track number of visible lines
+        self.log_queue = asyncio.Queue()  # Flushed log chunks waiting to be written to disk
+        self._log_task = None  # Background writer draining log_queue
+        self._log_fh = None  # Log file handle, opened once by the writer
+        self._row_buf = []  # Preformatted CSV rows not yet flushed
+        self.log_capacity = 1000  # Flush once this many rows are buffered
+        self.log_flush_interval = 60  # ...or once this many seconds have passed
+        self.last_flush_time = time.time()
 
     def db_to_bar(self, rssi):
         # Convert RSSI to a visual bar (stronger signals will have more bars)
         # RSSI typically ranges from -100 (weak) to -30 (strong)
-        strength = min(100, max(0, (100 + rssi)))  # Convert to 0-100 scale
-        filled_length = math.ceil((strength / 100.0) * self.bar_length)
-        bar = '█' * filled_length + '░' * (self.bar_length - filled_length)
-        return bar
+        return self._bar_table[0 if rssi <= -100 else 100 if rssi >= 0 else 100 + int(rssi)]
 
     def get_device_appearance(self, metadata):
-        if not metadata or 'appearance' not in metadata:
+        if not metadata:
             return 'Unknown'
-        # Common BLE appearance values
-        appearances = {
-            0: 'Unknown',
-            64: 'Generic Phone',
-            128: 'Generic Computer',
-            192: 'Generic Watch',
-            193: 'Sports Watch',
-            256: 'Generic Tag',
-            832: 'Generic Heart Rate Sensor',
-            960: 'Generic Blood Pressure',
-        }
-        return appearances.get(metadata.get('appearance'), 'Unknown')
+        return APPEARANCES.get(metadata.get('appearance'), 'Unknown')
 
     def format_services(self, metadata):
         if not metadata or 'uuids' not in metadata:
             return 'No services'
-        return ', '.join(str(uuid)[:8] for uuid in metadata.get('uuids', []))[:40]
+        return _services_summary(tuple(metadata.get('uuids', [])))
 
     def format_manufacturer(self, metadata):
         if not metadata or 'manufacturer_data' not in metadata:
@@ -74,125 +182,228 @@ class BLEScanner:
         if not mfg_data:
             return 'No manufacturer data'
         mfg_id, data = mfg_data[0]
-        return f'ID: {mfg_id:04x}, Data: {data.hex()[:20]}'
+        # Only the first 10 bytes (20 hex chars) are shown, so key the cache on those
+        return _manufacturer_summary(mfg_id, bytes(data[:10]))
 
     def sort_devices(self, devices, current_time):
-        """Sort devices based on current sort mode and group by activity"""
-        all_devices = sorted(devices.items(),
-                           key=lambda x: (x[1]['discovery_time'] if self.sort_mode == 'discovery' 
-                                        else (-x[1]['rssi'] if current_time - x[1]['last_seen'] <= self.inactive_threshold 
-                                             else float('-inf'))))
+        """Group devices by activity; active ones follow the sort mode, inactive ones recency"""
+        # Only re-sort when a device was added/removed, an RSSI changed or the
+        # sort mode was toggled; otherwise reuse the previous order
+        if self._sort_dirty:
+            signal_sort = self.sort_mode == 'signal'
+            key = itemgetter('rssi' if signal_sort else 'discovery_time')
+            self._sorted_addrs = [device['address'] for device in
+                                  sorted(devices.values(), key=key, reverse=signal_sort)]
+            self._sort_dirty = False
         
         active_devices = []
         inactive_devices = []
+        oldest_active = float('inf')
         
-        for addr, device in all_devices:
-            device_age = current_time - device['last_seen']
-            if device_age <= self.inactive_threshold:
+        # Compare timestamps against a single cutoff rather than computing each age
+        cutoff = current_time - self.inactive_threshold
+        for addr in self._sorted_addrs:
+            device = devices[addr]
+            last_seen = device['last_seen']
+            if last_seen >= cutoff:
                 active_devices.append((addr, device))
+                if last_seen < oldest_active:
+                    oldest_active = last_seen
             else:
                 inactive_devices.append((addr, device))
         
+        # Inactive devices have no current signal, so list them by how recently they
+        # were heard instead. Their last_seen only changes when they are heard again,
+        # which clears _inactive_key (see _apply_advertisement), so otherwise the
+        # order only needs re-sorting when the group's membership changes
+        inactive_key = frozenset(map(itemgetter(0), inactive_devices))
+        if inactive_key != self._inactive_key:
+            by_recency = sorted(map(itemgetter(1), inactive_devices),
+                                key=itemgetter('last_seen'), reverse=True)
+            self._inactive_order = [device['address'] for device in by_recency]
+            self._inactive_key = inactive_key
+        inactive_devices = [(addr, devices[addr]) for addr in self._inactive_order]
+        
+        # Moment the first active device will go inactive, so the main loop can
+        # redraw right when the grouping changes
+        self._next_inactive_time = oldest_active + self.inactive_threshold
+        
         return active_devices, inactive_devices
 
-    def check_keyboard(self):
-        if select.select([sys.stdin], [], [], 0)[0]:
-            key = sys.stdin.read(1)
-            if key == '\x1b':  # Arrow key prefix
-                next_two = sys.stdin.read(2)
-                current_time = time.time()
-                active_devices, inactive_devices = self.sort_devices(self.devices, current_time)
-                sorted_devices = active_devices + inactive_devices
-                
-                # Calculate content height
-                content_height = self.term.height - self.header_height
-                
-                if next_two == '[A':  # Up arrow
-                    if self.selected_device_address:
-                        current_index = next((i for i, (addr, _) in enumerate(sorted_devices) 
-                                           if addr == self.selected_device_address), 0)
-                        new_index = max(0, current_index - 1)
-                        self.selected_device_address = sorted_devices[new_index][0]
-                        
-                        # Adjust scroll if selection would be off screen
-                        if new_index < self.scroll_offset:
-                            self.scroll_offset = new_index
-                
-                elif next_two == '[B':  # Down arrow
-                    if sorted_devices:
-                        current_index = next((i for i, (addr, _) in enumerate(sorted_devices) 
-                                           if addr == self.selected_device_address), 0)
-                        new_index = min(len(sorted_devices) - 1, current_index + 1)
-                        self.selected_device_address = sorted_devices[new_index][0]
-                        
-                        # Adjust scroll if selection would be off screen
-                        if new_index >= self.scroll_offset + content_height:
-                            self.scroll_offset = max(0, new_index - content_height + 1)
-                
-                elif next_two == '[5':  # Page Up
-                    sys.stdin.read(1)  # Consume trailing ~
-                    self.scroll_offset = max(0, self.scroll_offset - content_height)
-                    if sorted_devices:
-                        visible_start = self.scroll_offset
-                        self.selected_device_address = sorted_devices[visible_start][0]
-                
-                elif next_two == '[6':  # Page Down
-                    sys.stdin.read(1)  # Consume trailing ~
-                    max_scroll = max(0, len(sorted_devices) - content_height)
-                    self.scroll_offset = min(max_scroll, self.scroll_offset + content_height)
-                    if sorted_devices:
-                        visible_start = min(self.scroll_offset, len(sorted_devices) - 1)
-                        self.selected_device_address = sorted_devices[visible_start][0]
+    def _on_resize(self):
+        """Refresh cached terminal dimensions after a SIGWINCH"""
+        self._width = self.term.width
+        self._height = self.term.height
+        self._sep = "-" * self._width
+        self._header_lines = None
+        self._last_lines = None
+        self._ui_dirty = True
+        self._wake_event.set()
+
+    def _on_key_ready(self):
+        """Handle everything waiting on stdin; called by the event loop when it is readable"""
+        # One read picks up whole escape sequences, so arrow keys never get split
+        try:
+            data = os.read(self._key_fd, 32)
+        except OSError:  # EIO once the terminal has hung up
+            data = b''
+        if not data:
+            # End of input: stop watching it instead of being called again and
+            # again for an fd that stays readable
+            self._stop_key_input()
+            return
+        for key in KEY_PATTERN.findall(data):
+            self.handle_key(key)
+
+    def _stop_key_input(self):
+        """Stop watching stdin and put back the blocking mode it had before"""
+        if self._key_fd is not None:
+            asyncio.get_running_loop().remove_reader(self._key_fd)
+            # Some event loops (uvloop) make a watched fd non-blocking, which the
+            # shell would otherwise inherit after exit
+            try:
+                os.set_blocking(self._key_fd, self._key_fd_blocking)
+            except OSError:
+                pass
+            self._key_fd = None
+
+    def handle_key(self, key):
+        """Dispatch a single key (raw bytes) to its handler; other keys are ignored"""
+        handler = self._key_handlers.get(key)
+        if handler is not None:
+            handler()
+            self._ui_dirty = True
+            self._wake_event.set()
+
+    def _select_up(self):
+        # Navigate the list in the order it was last drawn; scroll_offset counts
+        # screen rows (headings included), so compare it against the device's row
+        sorted_addrs = self._display_addrs
+        if self.selected_device_address and sorted_addrs:
+            current_index = self._sorted_index.get(self.selected_device_address, 0)
+            new_index = max(0, current_index - 1)
+            self.selected_device_address = sorted_addrs[new_index]
+            
+            # Adjust scroll if selection would be off screen
+            row = self._device_rows[new_index]
+            if row < self.scroll_offset:
+                self.scroll_offset = row
+
+    def _select_down(self):
+        sorted_addrs = self._display_addrs
+        if sorted_addrs:
+            content_height = self._height - self.header_height
+            current_index = self._sorted_index.get(self.selected_device_address, 0)
+            new_index = min(len(sorted_addrs) - 1, current_index + 1)
+            self.selected_device_address = sorted_addrs[new_index]
             
-            elif key in ['\r', '\n']:  # Enter key
-                if self.selected_device_address and self.selected_device_address in self.devices:
-                    self.view_mode = 'detail' if self.view_mode == 'list' else 'list'
-            elif key == 's':  # Toggle sort mode
-                self.sort_mode = 'signal' if self.sort_mode == 'discovery' else 'discovery'
-            elif key == 'q':  # Back to list view
-                self.view_mode = 'list'
-            elif key == '\x03':  # Ctrl+C
-                self.running = False
-                return True
-        return False
+            # Adjust scroll if selection would be off screen
+            row = self._device_rows[new_index]
+            if row >= self.scroll_offset + content_height:
+                self.scroll_offset = max(0, row - content_height + 1)
+
+    def _select_first_visible(self):
+        """Select the first device drawn at or below the current scroll position"""
+        if self._display_addrs:
+            index = min(bisect_left(self._device_rows, self.scroll_offset),
+                        len(self._display_addrs) - 1)
+            self.selected_device_address = self._display_addrs[index]
+
+    def _page_up(self):
+        content_height = self._height - self.header_height
+        self.scroll_offset = max(0, self.scroll_offset - content_height)
+        self._select_first_visible()
+
+    def _page_down(self):
+        content_height = self._height - self.header_height
+        max_scroll = max(0, len(self._line_templates) - content_height)
+        self.scroll_offset = min(max_scroll, self.scroll_offset + content_height)
+        self._select_first_visible()
+
+    def _toggle_view(self):
+        if self.selected_device_address and self.selected_device_address in self.devices:
+            self.view_mode = 'detail' if self.view_mode == 'list' else 'list'
+
+    def _toggle_sort(self):
+        self.sort_mode = 'signal' if self.sort_mode == 'discovery' else 'discovery'
+        self._sort_dirty = True
+        self._header_lines = None  # Header shows the sort mode
+
+    def _back_to_list(self):
+        self.view_mode = 'list'
+
+    def _quit(self):
+        self.running = False
 
     def log_devices(self):
-        """Log device information to CSV file"""
+        """Buffer device information as CSV rows for the background writer"""
         current_time = time.time()
         if current_time - self.last_log_time >= self.log_interval:
-            # Perform logging in a way that minimizes I/O operations
-            log_entries = []
-            utc_time = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
+            # Timestamps have one-second resolution, so format each second only once
+            ts_int = int(current_time)
+            if ts_int != self._ts_int:
+                self._ts_str = time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime(ts_int))
+                self._ts_int = ts_int
+            utc_time = self._ts_str
             self.scan_count += 1
             
-            log_entries.append([f'BEGIN SCAN BLOCK {self.scan_count}', '', '', '', ''])
-            
-            # Prepare all device entries
-            for device in self.devices.values():
-                log_entries.append([
-                    '',  # Empty block column
-                    utc_time,
-                    device['name'],
-                    device['address'],
-                    device['rssi']
-                ])
+            self._row_buf.append(f'BEGIN SCAN BLOCK {self.scan_count},,,,\r\n')
             
-            log_entries.append([f'END SCAN BLOCK {self.scan_count}', '', '', '', ''])
-            log_entries.append(['', '', '', '', ''])  # Empty line between blocks
-            
-            # Single file operation for all entries
-            with open(self.log_file, 'a', newline='') as f:
-                writer = csv.writer(f)
-                # Write header if file is empty
-                if f.tell() == 0:
-                    writer.writerow(['Block', 'Timestamp', 'Device Name', 'Address', 'RSSI'])
-                writer.writerows(log_entries)
+            # Only the RSSI varies per block; the name/address columns are kept
+            # preformatted (and CSV-quoted) on each device
+            row_start = f",{utc_time},"
+            self._row_buf.extend([f"{row_start}{device['log_cols']}{device['rssi']}\r\n"
+                                  for device in self.devices.values()])
             
+            self._row_buf.append(f'END SCAN BLOCK {self.scan_count},,,,\r\n')
+            self._row_buf.append(',,,,\r\n')  # Empty line between blocks
             self.last_log_time = current_time
+        
+        # Checked on every tick, not just when a block is added, so a crash loses
+        # at most log_flush_interval worth of rows
+        if self._row_buf and (len(self._row_buf) >= self.log_capacity
+                              or current_time - self.last_flush_time >= self.log_flush_interval):
+            self.flush_log()
 
-    def get_device_age(self, last_seen):
+    def flush_log(self):
+        """Hand all buffered rows to the writer task as a single encoded chunk"""
+        if self._row_buf:
+            self.log_queue.put_nowait(''.join(self._row_buf).encode())
+            self._row_buf = []
+        self.last_flush_time = time.time()
+
+    def _write_log_block(self, data):
+        """Append a chunk to the log file (blocking, runs in a worker thread)"""
+        if self._log_fh is None:
+            self._log_fh = open(self.log_file, 'ab')
+            # Write header if file is empty
+            if self._log_fh.tell() == 0:
+                self._log_fh.write(b'Block,Timestamp,Device Name,Address,RSSI\r\n')
+        self._log_fh.write(data)
+        self._log_fh.flush()
+
+    async def _log_writer(self):
+        """Drain queued log chunks to disk without stalling the scan loop"""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                data = await self.log_queue.get()
+                if data is None:  # Shutdown sentinel
+                    break
+                await loop.run_in_executor(None, self._write_log_block, data)
+        finally:
+            # If the task is cancelled, write out what is still queued before closing
+            while not self.log_queue.empty():
+                data = self.log_queue.get_nowait()
+                if data is not None:
+                    self._write_log_block(data)
+            if self._log_fh:
+                self._log_fh.close()
+                self._log_fh = None
+
+    def get_device_age(self, last_seen, current_time):
         """Convert last seen timestamp to human readable format"""
-        age = time.time() - last_seen
+        age = current_time - last_seen
         if age < 60:
             return f"{int(age)}s"
         elif age < 3600:
@@ -200,187 +411,457 @@ class BLEScanner:
         else:
             return f"{int(age/3600)}h"
 
+    def prune_devices(self, current_time):
+        """Drop devices not seen within device_timeout, returning how many were removed"""
+        # The heap holds one (last_seen, address) entry per device, so only
+        # entries that look expired are touched; refreshed ones are re-queued
+        removed_count = 0
+        cutoff = current_time - self.device_timeout
+        while self._expiry_heap and self._expiry_heap[0][0] < cutoff:
+            _, addr = heapq.heappop(self._expiry_heap)
+            device = self.devices.get(addr)
+            if device is None:
+                continue
+            if device['last_seen'] < cutoff:
+                del self.devices[addr]
+                self.discovery_times.pop(addr, None)
+                self._rssi_bufs.pop(addr, None)
+                removed_count += 1
+            else:
+                heapq.heappush(self._expiry_heap, (device['last_seen'], addr))
+        return removed_count
+
+    def _on_advertisement(self, device, advertisement_data):
+        """Queue an advertisement from Bleak for the main loop to apply"""
+        current_time = time.time()
+        self._adv_queue.append((device, advertisement_data, current_time))
+        # deque.append is thread-safe, but asyncio.Event is not: a backend that
+        # calls back from its own thread has to wake the loop through the loop
+        if threading.get_ident() == self._loop_thread:
+            self._wake_event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wake_event.set)
+
+    def _apply_advertisement(self, device, advertisement_data, current_time):
+        """Update a single device entry from a received advertisement"""
+        if device.address not in self.discovery_times:
+            self.discovery_times[device.address] = current_time
+        name = advertisement_data.local_name or device.name or 'Unknown'
+        
+        # Raw RSSI is very noisy; smooth it with a moving average over the last
+        # few advertisements so the display (and redraw rate) settles down
+        # (kept as [window, running total] so each update is O(1))
+        rssi_state = self._rssi_bufs.get(device.address)
+        if rssi_state is None:
+            rssi_state = self._rssi_bufs[device.address] = [deque(maxlen=self.rssi_window), 0]
+        rssi_buf = rssi_state[0]
+        if len(rssi_buf) == self.rssi_window:
+            rssi_state[1] -= rssi_buf[0]  # Reading about to fall out of the window
+        rssi_buf.append(advertisement_data.rssi)
+        rssi_state[1] += advertisement_data.rssi
+        rssi = rssi_state[1] // len(rssi_buf)
+        
+        # Display columns are built here, once per change, rather than per frame
+        entry = self.devices.get(device.address)
+        if entry is None:
+            self._sort_dirty = True
+            self._ui_dirty = True
+            heapq.heappush(self._expiry_heap, (current_time, device.address))
+            entry = self.devices[device.address] = {
+                'name': name,
+                'address': device.address,
+                'rssi': rssi,
+                'name_col': name[:self.max_name_length].ljust(self.max_name_length),
+                # Name and address CSV columns, quoted like csv.writer would
+                'log_cols': f"{_csv_field(name)},{_csv_field(device.address)},",
+                'addr_col': device.address.ljust(self.max_addr_length),
+                'bar': self.db_to_bar(rssi),
+                'status': f"{rssi} dBm".ljust(self.status_width),
+                'meta_sig': None,
+                'last_seen': current_time,
+                'discovery_time': self.discovery_times[device.address]
+            }
+        else:
+            # Known device: update the existing entry in place, touching only
+            # the fields whose value actually changed
+            if current_time - entry['last_seen'] > self.inactive_threshold:
+                self._ui_dirty = True  # Inactive device came back
+                # Its last_seen moves, so a cached inactive order may no longer hold
+                # even if it goes quiet again before the next sort
+                self._inactive_key = None
+            entry['last_seen'] = current_time
+            if entry['name'] != name:
+                self._ui_dirty = True
+                entry['name'] = name
+                entry['name_col'] = name[:self.max_name_length].ljust(self.max_name_length)
+                entry['log_cols'] = f"{_csv_field(name)},{_csv_field(device.address)},"
+            if entry['rssi'] != rssi:
+                self._sort_dirty = True
+                self._ui_dirty = True
+                entry['rssi'] = rssi
+                entry['bar'] = self.db_to_bar(rssi)
+                entry['status'] = f"{rssi} dBm".ljust(self.status_width)
+        
+        # Advertised services/manufacturer data almost never change, so only
+        # reformat them when their signature differs from the last advertisement.
+        # The signature holds just what is displayed (the UUIDs and the first
+        # manufacturer's id and leading bytes), never the full payloads
+        first_mfg = next(iter(advertisement_data.manufacturer_data.items()), None)
+        if first_mfg is not None:
+            first_mfg = (first_mfg[0], bytes(first_mfg[1][:10]))
+        meta_sig = (tuple(advertisement_data.service_uuids), first_mfg)
+        if entry['meta_sig'] != meta_sig:
+            # Only the formatted strings are kept on the entry, not the raw metadata
+            metadata = {
+                'uuids': advertisement_data.service_uuids,
+                'manufacturer_data': advertisement_data.manufacturer_data,
+            }
+            entry['meta_sig'] = meta_sig
+            entry['appearance'] = self.get_device_appearance(metadata)
+            entry['services'] = self.format_services(metadata)
+            entry['manufacturer'] = self.format_manufacturer(metadata)
+
     async def scan_devices(self):
         try:
             self.scan_count = 0
-            self.scanner = BleakScanner()
+            # Bleak pushes every advertisement to _on_advertisement, which queues
+            # it for the main loop; the scanner runs for the whole session without
+            # being polled
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread = threading.get_ident()
+            self.scanner = BleakScanner(detection_callback=self._on_advertisement)
             await self.scanner.start()
+            self._log_task = asyncio.create_task(self._log_writer())
             self.scroll_offset = 0  # Initialize scroll position
             
             with self.term.fullscreen(), self.term.hidden_cursor(), self.term.cbreak():
+                # Key presses wake the event loop directly instead of being polled.
+                # Without a terminal on stdin (/dev/null, a file or a pipe) there are
+                # no keys to read, so the scanner just runs until interrupted
+                loop = asyncio.get_running_loop()
+                if sys.stdin.isatty():
+                    try:
+                        self._key_fd_blocking = os.get_blocking(sys.stdin.fileno())
+                        loop.add_reader(sys.stdin.fileno(), self._on_key_ready)
+                        self._key_fd = sys.stdin.fileno()
+                    except (OSError, NotImplementedError):
+                        pass
+                if hasattr(signal, 'SIGWINCH'):  # Not available on Windows
+                    loop.add_signal_handler(signal.SIGWINCH, self._on_resize)
                 while self.running:
                     try:
-                        if self.check_keyboard():
-                            break
+                        # Apply the advertisements received since the last tick
+                        adv_queue = self._adv_queue
+                        while adv_queue:
+                            self._apply_advertisement(*adv_queue.popleft())
 
-                        devices = self.scanner.discovered_devices
                         current_time = time.time()
-                        
-                        # Update devices dictionary without affecting scroll position
-                        for device in devices:
-                            if device.address not in self.discovery_times:
-                                self.discovery_times[device.address] = current_time
-                            
-                            self.devices[device.address] = {
-                                'name': device.name or 'Unknown',
-                                'address': device.address,
-                                'rssi': device.rssi,
-                                'metadata': device.metadata,
-                                'appearance': self.get_device_appearance(device.metadata),
-                                'services': self.format_services(device.metadata),
-                                'manufacturer': self.format_manufacturer(device.metadata),
-                                'last_seen': current_time,
-                                'discovery_time': self.discovery_times[device.address]
-                            }
 
                         # Log devices less frequently
                         self.log_devices()
 
-                        # Remove very old devices while preserving scroll position
-                        current_devices = {k: v for k, v in self.devices.items() 
-                                        if current_time - v['last_seen'] <= self.device_timeout}
-                        removed_count = len(self.devices) - len(current_devices)
-                        if removed_count > 0:
-                            # Adjust scroll offset if devices were removed above current position
-                            self.scroll_offset = max(0, self.scroll_offset - removed_count)
-                        
-                        self.discovery_times = {k: v for k, v in self.discovery_times.items()
-                                              if k in current_devices}
-                        self.devices = current_devices
-
-                        # Sort devices for display
-                        active_devices, inactive_devices = self.sort_devices(self.devices, current_time)
-                        sorted_devices = active_devices + inactive_devices
-
-                        # Update screen at controlled intervals
-                        if current_time - self.last_screen_update >= self.screen_update_interval:
+                        # Remove very old devices while preserving scroll position. The
+                        # timeout is minutes long, so checking every few seconds is plenty
+                        if current_time - self.last_prune_time >= self.prune_interval:
+                            removed_count = self.prune_devices(current_time)
+                            if removed_count > 0:
+                                # Adjust scroll offset if devices were removed above current position
+                                self.scroll_offset = max(0, self.scroll_offset - removed_count)
+                                self._sort_dirty = True
+                                self._ui_dirty = True
+                            self.last_prune_time = current_time
+
+                        # A device dropping out of the active group changes the display
+                        if current_time > self._next_inactive_time:
+                            self._ui_dirty = True
+                            self._next_inactive_time = float('inf')  # Recomputed on the next sort
+
+                        # Update screen at controlled intervals, and only when something
+                        # changed or the idle refresh is due (ages and activity drift)
+                        since_update = current_time - self.last_screen_update
+                        if since_update >= self._frame_interval and (
+                                self._ui_dirty or since_update >= self.idle_refresh_interval):
+                            render_start = time.perf_counter()
+                            self._ui_dirty = False  # write_frame sets it again if it skips the frame
                             if self.view_mode == 'list':
-                                self.display_list_view(sorted_devices, current_time)
+                                # Sort devices for display
+                                active_devices, inactive_devices = self.sort_devices(self.devices, current_time)
+                                self.display_list_view(active_devices, inactive_devices, current_time)
                             else:
-                                print(self.term.home + self.term.clear)
                                 self.display_detail_view(current_time)
 
-                            sys.stdout.flush()
+                            if not self.term.does_styling:
+                                sys.stdout.flush()  # Terminal frames are flushed by write_frame
                             self.last_screen_update = current_time
 
-                        await asyncio.sleep(0.05)
+                            # Slow terminals (e.g. over SSH) take longer to accept a
+                            # frame; keep drawing to at most about a third of the time
+                            render_time = time.perf_counter() - render_start
+                            self._render_time_ema = 0.8 * self._render_time_ema + 0.2 * render_time
+                            self._frame_interval = max(self.screen_update_interval,
+                                                       min(self.max_screen_update_interval, 3 * self._render_time_ema))
+
+                        # Sleep until the next thing that is due: a pending frame (or the
+                        # idle refresh), a log block, a prune or a device going inactive
+                        if self._ui_dirty:
+                            next_frame = self.last_screen_update + self._frame_interval
+                        else:
+                            next_frame = self.last_screen_update + self.idle_refresh_interval
+                        if self._row_buf:
+                            next_log = min(self.last_log_time + self.log_interval,
+                                           self.last_flush_time + self.log_flush_interval)
+                        else:
+                            next_log = self.last_log_time + self.log_interval
+                        deadline = min(next_frame,
+                                       next_log,
+                                       self.last_prune_time + self.prune_interval,
+                                       self._next_inactive_time)
+                        timeout = max(0.0, deadline - time.time())
+                        if self._ui_dirty:
+                            # A frame is already waiting; input can't draw it any sooner
+                            await asyncio.sleep(timeout)
+                        else:
+                            # Advertisements and key presses set _wake_event and end the
+                            # wait early, but bursts are handled at most every min_tick
+                            self._wake_event.clear()
+                            try:
+                                await asyncio.wait_for(self._wake_event.wait(), timeout)
+                            except asyncio.TimeoutError:
+                                pass
+                            else:
+                                rest = current_time + self.min_tick - time.time()
+                                if rest > 0:
+                                    await asyncio.sleep(rest)
 
                     except Exception as e:
-                        print(f"Error during scan: {e}")
+                        try:
+                            print(f"Error during scan: {e}")
+                        except BlockingIOError:
+                            pass  # Stays buffered; flush_output sends it before the next frame
                         await asyncio.sleep(1)
                         continue
 
         except KeyboardInterrupt:
             pass
         finally:
+            loop = asyncio.get_running_loop()
+            self._stop_key_input()
+            if hasattr(signal, 'SIGWINCH'):
+                loop.remove_signal_handler(signal.SIGWINCH)
             if self.scanner:
                 await self.scanner.stop()
+            if self._log_task:
+                # Let the writer flush whatever is still buffered, then exit
+                self.flush_log()
+                self.log_queue.put_nowait(None)
+                await self._log_task
+            if self.term.does_styling:
+                # Finish a partly written frame first; stdin (and with it the tty)
+                # is back in blocking mode by now
+                self.flush_output()
+                print(WRAP_ON)
             print(self.term.exit_fullscreen())
             print(self.term.normal_cursor())
-            print(self.term.change_scroll_region(0, self.term.height))
             print("\nScanning stopped by user")
 
-    def display_list_view(self, sorted_devices, current_time):
-        active_devices, inactive_devices = self.sort_devices(self.devices, current_time)
-        total_active = len(active_devices)
-        total_inactive = len(inactive_devices)
-        
-        # Calculate available display space
-        content_height = self.term.height - self.header_height
-        
-        # Clear screen
-        print(self.term.home + self.term.clear)
-        
-        # Fixed header section (always visible)
-        with self.term.location(0, 0):
-            print(self.term.clear_eos + f"BLE Device Scanner - Press Ctrl+C to exit | ↑/↓ navigate | PgUp/PgDn scroll | Home/End first/last | Enter toggle details | 's' sort ({self.sort_mode})")
-            print(f"Logging to: {self.log_file}")
-            print("-" * self.term.width)
-            
-            address_header = "ADDRESS" + " " * 11
-            print(f"{'Device Name':<{self.max_name_length}} | {address_header:<{self.max_addr_length}} | {'Signal':<{self.bar_length}} | {'Status':<{self.status_width}}")
-            print("-" * self.term.width)
-
-        # Set up scrolling region below the header
-        print(self.term.hide_cursor())
-        print(self.term.change_scroll_region(self.header_height, self.term.height))
-        print(self.term.move(self.header_height, 0))
-        
-        # Prepare all lines that will be displayed
-        display_lines = []
+    def build_line_templates(self, active_devices, inactive_devices):
+        """Specialize the list view for the current device order and selection"""
+        # Each entry is (template, address, active). Headings are plain text with
+        # no address; device rows already carry their highlight escapes, so
+        # drawing a frame only fills in the per-device values.
+        reverse, dim, normal = self._reverse_prefix, self._dim_prefix, self._style_suffix
+        inactive_fmt = self._row_fmt.replace('{bar}', self._inactive_bar)
+        templates = []
         
         if active_devices:
-            display_lines.append(f"\nActive Devices ({total_active}):")
-            for addr, device in active_devices:
-                name = device['name'][:self.max_name_length]
-                name = f"{name:<{self.max_name_length}}"
-                address = f"{device['address']:<{self.max_addr_length}}"
-                bar = self.db_to_bar(device['rssi'])
-                status = f"{device['rssi']} dBm"
-                status = f"{status:<{self.status_width}}"
-                
-                line = f"{name} | {address} | {bar} | {status}"
+            templates.append(("", None, True))
+            templates.append((f"Active Devices ({len(active_devices)}):", None, True))
+            for addr, _ in active_devices:
                 if addr == self.selected_device_address:
-                    line = self.term.reverse(line)
-                display_lines.append(line)
+                    templates.append((reverse + self._row_fmt + normal, addr, True))
+                else:
+                    templates.append((self._row_fmt, addr, True))
         
         if inactive_devices:
-            display_lines.append(f"\nInactive Devices ({total_inactive}):")
-            for addr, device in inactive_devices:
-                name = device['name'][:self.max_name_length]
-                name = f"{name:<{self.max_name_length}}"
-                address = f"{device['address']:<{self.max_addr_length}}"
-                bar = "." * self.bar_length
-                status = f"Last seen {self.get_device_age(device['last_seen'])} ago"
-                status = f"{status:<{self.status_width}}"
-                
-                line = f"{name} | {address} | {bar} | {status}"
+            templates.append(("", None, False))
+            templates.append((f"Inactive Devices ({len(inactive_devices)}):", None, False))
+            for addr, _ in inactive_devices:
                 if addr == self.selected_device_address:
-                    line = self.term.reverse(line)
+                    templates.append((reverse + inactive_fmt + normal, addr, False))
                 else:
-                    line = self.term.dim(line)
-                display_lines.append(line)
+                    templates.append((dim + inactive_fmt + normal, addr, False))
         
-        if not display_lines:
-            display_lines.append("\nNo devices found")
+        if not templates:
+            templates.append(("", None, False))
+            templates.append(("No devices found", None, False))
+        
+        return templates
+
+    def write_frame(self, lines):
+        """Write a frame, repainting only the screen rows that changed since the last one"""
+        if not self.term.does_styling:
+            # Not a terminal (e.g. redirected output): no cursor control, just dump it
+            sys.stdout.write("\n".join(lines) + "\n")
+            return
+        
+        out = [self._bsu]
+        if self._last_lines is None:
+            # First frame or terminal resized: start from a clean screen. Autowrap is
+            # turned off so over-long rows are clipped instead of spilling into the
+            # row below, which may not be repainted
+            out.append(self._full_repaint)
+            self._row_prefixes = [self.term.move_yx(row, 0) + self.term.clear_eol
+                                  for row in range(self._height)]
+            previous = []
+        else:
+            previous = self._last_lines
+        
+        prefixes = self._row_prefixes
+        for row in range(max(len(lines), len(previous))):
+            line = lines[row] if row < len(lines) else ""
+            if row >= len(previous) or previous[row] != line:
+                if row < len(prefixes):
+                    out.append(prefixes[row] + line)
+                else:
+                    out.append(self.term.move_yx(row, 0) + self.term.clear_eol + line)
+        out.append(self._esu)
+        
+        # A terminal that is still busy with the previous frame (or stopped with
+        # Ctrl-S) gets no new one; the frame is redrawn once it catches up
+        if not self.flush_output():
+            self._ui_dirty = True
+            return
+        
+        # One write straight to the terminal, bypassing the text layer. Whatever the
+        # terminal doesn't take in time is kept and sent first next time, so the
+        # screen still ends up matching _last_lines
+        self._pending_output = "".join(out).encode(sys.stdout.encoding or 'utf-8', 'replace')
+        self.flush_output()
+        self._last_lines = lines
+
+    def flush_output(self):
+        """Send buffered terminal output, waiting at most write_timeout; True once all is out"""
+        # The tty can be non-blocking (uvloop sets O_NONBLOCK on stdin, which shares
+        # it), so writes may stop part way; never wait on the terminal indefinitely
+        try:
+            sys.stdout.flush()  # Anything printed goes before the frame data
+        except BlockingIOError:
+            return False  # Kept in sys.stdout's buffer for the next attempt
+        data = self._pending_output
+        fd = sys.stdout.fileno()
+        deadline = time.monotonic() + self.write_timeout
+        while data:
+            try:
+                data = data[os.write(fd, data):]
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([], [fd], [], remaining)[1]:
+                    break
+        self._pending_output = data
+        return not data
+
+    def build_header_lines(self):
+        """Build the fixed list view header for the current width and sort mode"""
+        address_header = "ADDRESS" + " " * 11
+        return [
+            f"BLE Device Scanner - Press Ctrl+C to exit | ↑/↓ navigate | PgUp/PgDn scroll | Home/End first/last | Enter toggle details | 's' sort ({self.sort_mode})",
+            f"Logging to: {self.log_file}",
+            self._sep,
+            f"{'Device Name':<{self.max_name_length}} | {address_header:<{self.max_addr_length}} | {'Signal':<{self.bar_length}} | {'Status':<{self.status_width}}",
+            self._sep,
+        ]
+
+    def display_list_view(self, active_devices, inactive_devices, current_time):
+        # Calculate available display space
+        content_height = self._height - self.header_height
+        
+        # Fixed header section (always visible), rebuilt only on resize or sort change
+        if self._header_lines is None:
+            self._header_lines = self.build_header_lines()
+        lines = list(self._header_lines)
+        
+        # Line templates only change with the device order or the selection
+        template_key = (tuple(map(itemgetter(0), active_devices)),
+                        tuple(map(itemgetter(0), inactive_devices)),
+                        self.selected_device_address)
+        if template_key != self._template_key:
+            self._line_templates = self.build_line_templates(active_devices, inactive_devices)
+            self._template_key = template_key
+            # Keyboard navigation walks this order; the index avoids linear searches
+            self._display_addrs = template_key[0] + template_key[1]
+            self._sorted_index = {addr: i for i, addr in enumerate(self._display_addrs)}
+            # Screen row of each of those devices within the list (headings take rows too)
+            self._device_rows = [row for row, (_, addr, _) in enumerate(self._line_templates)
+                                 if addr is not None]
 
         # Calculate valid scroll range
-        max_scroll = max(0, len(display_lines) - content_height)
+        max_scroll = max(0, len(self._line_templates) - content_height)
         self.scroll_offset = max(0, min(self.scroll_offset, max_scroll))
         
-        # Display visible portion of the list
-        visible_lines = display_lines[self.scroll_offset:self.scroll_offset + content_height]
-        print("\n".join(visible_lines))
+        # Fill in only the visible portion of the list
+        for template, addr, active in self._line_templates[self.scroll_offset:self.scroll_offset + content_height]:
+            if addr is None:
+                lines.append(template)
+            elif active:
+                lines.append(template.format_map(self.devices[addr]))
+            else:
+                device = self.devices[addr]
+                # Ages are coarse ("5s", "3m", "1h"), so many rows share a status
+                age = self.get_device_age(device['last_seen'], current_time)
+                status = self._age_status.get(age)
+                if status is None:
+                    status = self._age_status[age] = f"Last seen {age} ago".ljust(self.status_width)
+                lines.append(template.format(
+                    name_col=device['name_col'],
+                    addr_col=device['addr_col'],
+                    status=status))
         
-        # Reset scroll region
-        print(self.term.change_scroll_region(0, self.term.height))
+        self.write_frame(lines)
 
     def display_detail_view(self, current_time):
+        lines = [""]
+        
         if self.selected_device_address in self.devices:
             device = self.devices[self.selected_device_address]
             device_age = current_time - device['last_seen']
             
-            print(f"\nDetailed View for Selected Device:")
-            print("-" * self.term.width)
-            print(f"Device Name: {device['name']}")
-            print(f"Address: {device['address']}")
+            lines.append("")
+            lines.append("Detailed View for Selected Device:")
+            lines.append(self._sep)
+            lines.append(f"Device Name: {device['name']}")
+            lines.append(f"Address: {device['address']}")
             
             if device_age <= self.inactive_threshold:
-                print(f"Signal Strength: {self.db_to_bar(device['rssi'])} ({device['rssi']} dBm)")
+                lines.append(f"Signal Strength: {self.db_to_bar(device['rssi'])} ({device['rssi']} dBm)")
             else:
-                print(f"Signal Strength: No current signal (Last seen {self.get_device_age(device['last_seen'])} ago)")
+                lines.append(f"Signal Strength: No current signal (Last seen {self.get_device_age(device['last_seen'], current_time)} ago)")
             
-            print(f"Device Type: {device['appearance']}")
-            print(f"Services: {device['services']}")
-            print(f"Manufacturer: {device['manufacturer']}")
-            print(f"\nPress 'q' to return to list view")
+            lines.append(f"Device Type: {device['appearance']}")
+            lines.append(f"Services: {device['services']}")
+            lines.append(f"Manufacturer: {device['manufacturer']}")
+            lines.append("")
+            lines.append("Press 'q' to return to list view")
+        
+        self.write_frame(lines)
 
 async def main():
     scanner = BLEScanner()
     await scanner.scan_devices()
 
 if __name__ == "__main__":
+    run = asyncio.run
+    try:
+        import uvloop  # Optional, faster event loop (not available on Windows)
+    except ImportError:
+        pass
+    else:
+        if hasattr(uvloop, 'run'):
+            # uvloop >= 0.18; event loop policies are deprecated from Python 3.14
+            run = uvloop.run
+        else:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     try:
-        asyncio.run(main())
+        run(main())
     except KeyboardInterrupt:
         pass
\ No newline at end of file